@@ -1,8 +1,13 @@
 """Admin commands and panel for MedusaXD Bot"""
 
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter, BadRequest
 from datetime import datetime
 from typing import List
 
@@ -13,45 +18,143 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=4096)
+def _format_date(d) -> str:
+    """ISO date string, cached - strftime is slow and dates repeat across rows"""
+    return d.isoformat()
+
+@lru_cache(maxsize=4096)
+def _format_short_date(d) -> str:
+    """MM-DD date string for compact listings, cached"""
+    return f"{d.month:02d}-{d.day:02d}"
+
+# How long cached stats/status values stay fresh (seconds)
+STATS_CACHE_TTL = 30
+
+# Admin membership changes rarely - cache checks for a minute
+ADMIN_CACHE_TTL = 60
+ADMIN_CACHE_MAX_SIZE = 1024
+
+# Static text blocks and keyboards, built once at import instead of per call
+BACK_KEYBOARD = InlineKeyboardMarkup([[
+    InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")
+]])
+
+REFRESH_PANEL_KEYBOARD = InlineKeyboardMarkup([[
+    InlineKeyboardButton("🔄 Refresh Panel", callback_data="admin_refresh")
+]])
+
+PANEL_TEMPLATE = (
+    "🔧 **MedusaXD Admin Panel**\n\n"
+
+    "**📊 Bot Statistics:**\n"
+    "• Status: {status}\n"
+    "• Total Users: `{total_users}`\n"
+    "• Banned Users: `{total_banned}`\n"
+    "• Total Generations: `{total_generations}`\n"
+    "• Recent (24h): `{recent_generations_24h}`\n"
+    "• Active Users (7d): `{active_users_7d}`\n\n"
+
+    "**🎛️ Use the buttons below to manage the bot:**"
+)
+
+def _format_panel_text(stats: dict, enabled: bool) -> str:
+    """Format the admin panel text from a precompiled template"""
+    return PANEL_TEMPLATE.format(
+        status='✅ Enabled' if enabled else '🔴 Disabled',
+        total_users=stats.get('total_users', 0),
+        total_banned=stats.get('total_banned', 0),
+        total_generations=stats.get('total_generations', 0),
+        recent_generations_24h=stats.get('recent_generations_24h', 0),
+        active_users_7d=stats.get('active_users_7d', 0)
+    )
+
+BROADCAST_INFO_TEXT = (
+    "📢 **Broadcast Messages**\n\n"
+
+    "**How to broadcast:**\n"
+    "• `/broadcast <message>` - Send to all users\n\n"
+
+    "**Features:**\n"
+    "• Supports Markdown formatting\n"
+    "• Sends to all authorized users\n"
+    "• Shows delivery statistics\n\n"
+
+    "**Example:**\n"
+    "`/broadcast 🎉 **Update Alert**\\n\\nNew features available!`\n\n"
+
+    "⚠️ **Note:** Use broadcasts responsibly to avoid spam."
+)
+
+ADD_USER_USAGE = (
+    "❌ **Invalid usage**\n\n"
+    "**Usage:** `/adduser <user_id>`\n"
+    "**Example:** `/adduser 123456789`"
+)
+
+REMOVE_USER_USAGE = (
+    "❌ **Invalid usage**\n\n"
+    "**Usage:** `/removeuser <user_id>`\n"
+    "**Example:** `/removeuser 123456789`"
+)
+
+BAN_USER_USAGE = (
+    "❌ **Invalid usage**\n\n"
+    "**Usage:** `/ban <user_id> [reason]`\n"
+    "**Example:** `/ban 123456789 Spam behavior`"
+)
+
+UNBAN_USER_USAGE = (
+    "❌ **Invalid usage**\n\n"
+    "**Usage:** `/unban <user_id>`\n"
+    "**Example:** `/unban 123456789`"
+)
+
+BROADCAST_USAGE = (
+    "❌ **No message provided**\n\n"
+    "**Usage:** `/broadcast <message>`\n"
+    "**Example:** `/broadcast 🎉 **Update Alert**\\n\\nNew features available!`\n\n"
+    "**Note:** Use \\\\n for line breaks in the message."
+)
+
 class AdminHandler:
     def __init__(self, db: Database, bot_logger: BotLogger, config: Config):
         self.db = db
         self.bot_logger = bot_logger
         self.config = config
 
-    async def _check_admin(self, user_id: int) -> bool:
-        """Check if user is admin"""
-        return await self.db.is_admin(user_id)
-
-    async def admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Show admin panel with buttons"""
-        user_id = update.effective_user.id
-
-        if not await self._check_admin(user_id):
-            await update.message.reply_text("❌ **Access Denied** - Admin only command.")
-            return
-
-        # Get statistics
-        stats = await self.db.get_stats()
-        bot_status = await self.db.get_bot_status()
-
-        # Create admin panel message
-        panel_text = (
-            "🔧 **MedusaXD Admin Panel**\n\n"
-
-            f"**📊 Bot Statistics:**\n"
-            f"• Status: {'✅ Enabled' if bot_status.get('enabled', True) else '🔴 Disabled'}\n"
-            f"• Total Users: `{stats.get('total_users', 0)}`\n"
-            f"• Banned Users: `{stats.get('total_banned', 0)}`\n"
-            f"• Total Generations: `{stats.get('total_generations', 0)}`\n"
-            f"• Recent (24h): `{stats.get('recent_generations_24h', 0)}`\n"
-            f"• Active Users (7d): `{stats.get('active_users_7d', 0)}`\n\n"
-
-            "**🎛️ Use the buttons below to manage the bot:**"
-        )
-
-        # Create keyboard
-        keyboard = [
+        # Short-TTL cache for expensive aggregation queries (key -> (monotonic_ts, value))
+        self._stats_cache = {}
+        self._stats_cache_locks = {}
+
+        # Bounded TTL LRU for admin checks (user_id -> (monotonic_ts, is_admin))
+        self._admin_cache = OrderedDict()
+
+        # Last rendered panel per message, to skip no-op edits
+        # ((chat_id, message_id) -> hash of rendered content)
+        self._last_panel_hash = {}
+
+        # Panel keyboards are immutable, so build both variants once
+        self._panel_kb_enabled = self._build_panel_keyboard(enabled=True)
+        self._panel_kb_disabled = self._build_panel_keyboard(enabled=False)
+
+        # Strong refs to in-flight background log tasks so they aren't GC'd
+        self._log_tasks = set()
+
+        # Callback dispatch table (callback_data -> handler)
+        self._cb_routes = {
+            "admin_refresh": self._refresh_admin_panel,
+            "admin_users": self._show_users_management,
+            "admin_bans": self._show_bans_management,
+            "admin_stats": self._show_detailed_stats,
+            "admin_broadcast": self._show_broadcast_info,
+            "admin_toggle_bot": self._toggle_bot_status,
+        }
+
+    @staticmethod
+    def _build_panel_keyboard(enabled: bool) -> InlineKeyboardMarkup:
+        """Build the admin panel keyboard for the given bot status"""
+        return InlineKeyboardMarkup([
             [
                 InlineKeyboardButton("👥 Manage Users", callback_data="admin_users"),
                 InlineKeyboardButton("🚫 Manage Bans", callback_data="admin_bans")
@@ -62,14 +165,95 @@ class AdminHandler:
             ],
             [
                 InlineKeyboardButton(
-                    "🔴 Disable Bot" if bot_status.get('enabled', True) else "✅ Enable Bot",
+                    "🔴 Disable Bot" if enabled else "✅ Enable Bot",
                     callback_data="admin_toggle_bot"
                 ),
                 InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh")
             ]
-        ]
+        ])
+
+    def _render_panel(self, stats: dict, bot_status: dict):
+        """Render the admin panel text and pick the matching keyboard"""
+        enabled = bot_status.get('enabled', True)
+
+        panel_text = _format_panel_text(stats, enabled)
+        reply_markup = self._panel_kb_enabled if enabled else self._panel_kb_disabled
+        return panel_text, reply_markup
+
+    async def _cached(self, key: str, coro_factory, ttl: float = STATS_CACHE_TTL):
+        """Return a cached value for key, refreshing via coro_factory when stale"""
+        entry = self._stats_cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+
+        # One refresh at a time per key so a burst of admin clicks
+        # doesn't launch parallel aggregation queries
+        lock = self._stats_cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._stats_cache.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+
+            value = await coro_factory()
+            self._stats_cache[key] = (time.monotonic(), value)
+            return value
+
+    def _invalidate_cache(self, key: str):
+        """Drop a cached value so the next read hits the database"""
+        self._stats_cache.pop(key, None)
+
+    async def _get_stats(self) -> dict:
+        """Get bot statistics (cached)"""
+        return await self._cached("stats", self.db.get_stats)
+
+    async def _get_bot_status(self) -> dict:
+        """Get bot status (cached)"""
+        return await self._cached("bot_status", self.db.get_bot_status)
+
+    async def _check_admin(self, user_id: int) -> bool:
+        """Check if user is admin (cached to avoid a DB round-trip per command)"""
+        now = time.monotonic()
+        entry = self._admin_cache.get(user_id)
+        if entry and now - entry[0] < ADMIN_CACHE_TTL:
+            self._admin_cache.move_to_end(user_id)
+            return entry[1]
+
+        is_admin = await self.db.is_admin(user_id)
+        self._admin_cache[user_id] = (now, is_admin)
+        self._admin_cache.move_to_end(user_id)
+        while len(self._admin_cache) > ADMIN_CACHE_MAX_SIZE:
+            self._admin_cache.popitem(last=False)
+        return is_admin
+
+    def invalidate_admin(self, user_id: int):
+        """Drop a cached admin check after admin membership changes"""
+        self._admin_cache.pop(user_id, None)
+
+    def _log_in_background(self, *coros):
+        """Fire log writes as a background task so the admin reply isn't delayed"""
+        async def run_logs():
+            results = await asyncio.gather(*coros, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Background log write failed: {result}")
+
+        task = asyncio.create_task(run_logs())
+        self._log_tasks.add(task)
+        task.add_done_callback(self._log_tasks.discard)
+
+    async def admin_panel(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Show admin panel with buttons"""
+        user_id = update.effective_user.id
+
+        if not await self._check_admin(user_id):
+            await update.message.reply_text("❌ **Access Denied** - Admin only command.")
+            return
+
+        # Get statistics
+        stats = await self._get_stats()
+        bot_status = await self._get_bot_status()
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        panel_text, reply_markup = self._render_panel(stats, bot_status)
 
         await update.message.reply_text(
             panel_text,
@@ -88,88 +272,73 @@ class AdminHandler:
 
         await query.answer()
 
-        if query.data == "admin_refresh":
-            # Refresh the admin panel
-            await self._refresh_admin_panel(query)
-        elif query.data == "admin_users":
-            await self._show_users_management(query)
-        elif query.data == "admin_bans":
-            await self._show_bans_management(query)
-        elif query.data == "admin_stats":
-            await self._show_detailed_stats(query)
-        elif query.data == "admin_broadcast":
-            await self._show_broadcast_info(query)
-        elif query.data == "admin_toggle_bot":
-            await self._toggle_bot_status(query)
+        # Any view other than refresh replaces the panel content, so the
+        # stored render hash no longer describes what's on screen
+        if query.data != "admin_refresh":
+            self._last_panel_hash.pop(
+                (query.message.chat_id, query.message.message_id), None
+            )
+
+        handler = self._cb_routes.get(query.data)
+        if handler:
+            await handler(query)
 
     async def _refresh_admin_panel(self, query):
         """Refresh the admin panel"""
-        stats = await self.db.get_stats()
-        bot_status = await self.db.get_bot_status()
+        stats = await self._get_stats()
+        bot_status = await self._get_bot_status()
 
-        panel_text = (
-            "🔧 **MedusaXD Admin Panel**\n\n"
+        panel_text, reply_markup = self._render_panel(stats, bot_status)
 
-            f"**📊 Bot Statistics:**\n"
-            f"• Status: {'✅ Enabled' if bot_status.get('enabled', True) else '🔴 Disabled'}\n"
-            f"• Total Users: `{stats.get('total_users', 0)}`\n"
-            f"• Banned Users: `{stats.get('total_banned', 0)}`\n"
-            f"• Total Generations: `{stats.get('total_generations', 0)}`\n"
-            f"• Recent (24h): `{stats.get('recent_generations_24h', 0)}`\n"
-            f"• Active Users (7d): `{stats.get('active_users_7d', 0)}`\n\n"
-
-            "**🎛️ Use the buttons below to manage the bot:**"
-        )
-
-        keyboard = [
-            [
-                InlineKeyboardButton("👥 Manage Users", callback_data="admin_users"),
-                InlineKeyboardButton("🚫 Manage Bans", callback_data="admin_bans")
-            ],
-            [
-                InlineKeyboardButton("📊 Detailed Stats", callback_data="admin_stats"),
-                InlineKeyboardButton("📢 Broadcast", callback_data="admin_broadcast")
-            ],
-            [
-                InlineKeyboardButton(
-                    "🔴 Disable Bot" if bot_status.get('enabled', True) else "✅ Enable Bot",
-                    callback_data="admin_toggle_bot"
-                ),
-                InlineKeyboardButton("🔄 Refresh", callback_data="admin_refresh")
-            ]
-        ]
+        # Skip the Telegram round-trip when nothing changed; editing with
+        # identical content would only earn a "message is not modified" error
+        key = (query.message.chat_id, query.message.message_id)
+        content_hash = hash((panel_text, bot_status.get('enabled', True)))
+        if self._last_panel_hash.get(key) == content_hash:
+            return
 
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        try:
+            await query.edit_message_text(
+                panel_text,
+                parse_mode='Markdown',
+                reply_markup=reply_markup
+            )
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
 
-        await query.edit_message_text(
-            panel_text,
-            parse_mode='Markdown',
-            reply_markup=reply_markup
-        )
+        self._last_panel_hash[key] = content_hash
 
     async def _show_users_management(self, query):
         """Show users management interface"""
-        users = await self.db.get_authorized_users()
+        total_users = await self.db.count_authorized_users()
 
-        if not users:
+        if not total_users:
             text = "👥 **User Management**\n\n❌ No authorized users found."
         else:
-            text = f"👥 **User Management** ({len(users)} users)\n\n"
+            # Only 10 rows are displayed - fetch just those, and just the
+            # fields the view actually renders
+            users = await self.db.get_authorized_users(
+                limit=10,
+                projection=["user_id", "username", "total_generations", "last_active"]
+            )
+
+            text = f"👥 **User Management** ({total_users} users)\n\n"
 
-            for user in users[:10]:  # Show first 10 users
+            for user in users:  # Show first 10 users
                 username = user.get('username', 'Unknown')
                 user_id = user['user_id']
                 generations = user.get('total_generations', 0)
                 last_active = user.get('last_active', 'Never')
 
                 if isinstance(last_active, datetime):
-                    last_active = last_active.strftime('%Y-%m-%d')
+                    last_active = _format_date(last_active.date())
 
                 text += f"• @{username} (`{user_id}`)\n"
                 text += f"  Generations: {generations} | Active: {last_active}\n\n"
 
-            if len(users) > 10:
-                text += f"... and {len(users) - 10} more users\n\n"
+            if total_users > 10:
+                text += f"... and {total_users - 10} more users\n\n"
 
             text += (
                 "**Commands:**\n"
@@ -178,38 +347,37 @@ class AdminHandler:
                 "• `/removeuser <user_id>` - Remove user"
             )
 
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
             text,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=BACK_KEYBOARD
         )
 
     async def _show_bans_management(self, query):
         """Show bans management interface"""
-        banned_users = await self.db.get_banned_users()
+        # Count at the database and fetch only the rows shown
+        total_banned = await self.db.count_banned_users()
+        banned_users = await self.db.get_banned_users(limit=10) if total_banned else []
 
         if not banned_users:
             text = "🚫 **Ban Management**\n\n✅ No banned users."
         else:
-            text = f"🚫 **Ban Management** ({len(banned_users)} banned)\n\n"
+            text = f"🚫 **Ban Management** ({total_banned} banned)\n\n"
 
-            for ban in banned_users[:10]:  # Show first 10 bans
+            for ban in banned_users:  # Show first 10 bans
                 user_id = ban['user_id']
                 reason = ban.get('reason', 'No reason')
                 banned_at = ban.get('banned_at', 'Unknown')
 
                 if isinstance(banned_at, datetime):
-                    banned_at = banned_at.strftime('%Y-%m-%d')
+                    banned_at = _format_date(banned_at.date())
 
                 text += f"• User `{user_id}`\n"
                 text += f"  Reason: {reason}\n"
                 text += f"  Banned: {banned_at}\n\n"
 
-            if len(banned_users) > 10:
-                text += f"... and {len(banned_users) - 10} more bans\n\n"
+            if total_banned > 10:
+                text += f"... and {total_banned - 10} more bans\n\n"
 
             text += (
                 "**Commands:**\n"
@@ -217,18 +385,18 @@ class AdminHandler:
                 "• `/unban <user_id>` - Unban user"
             )
 
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
             text,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=BACK_KEYBOARD
         )
 
     async def _show_detailed_stats(self, query):
         """Show detailed statistics"""
-        stats = await self.db.get_stats()
+        stats = await self._get_stats()
+
+        # isoformat is ~3x faster than strftime, and utcnow matches the label
+        now_str = datetime.utcnow().isoformat(sep=" ", timespec="seconds")
 
         text = (
             "📊 **Detailed Statistics**\n\n"
@@ -248,16 +416,13 @@ class AdminHandler:
             f"• Max images per request: `{self.config.MAX_IMAGES_PER_REQUEST}`\n"
             f"• Default model: `{self.config.DEFAULT_MODEL}`\n\n"
 
-            f"**📅 Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"
+            f"**📅 Generated on:** {now_str} UTC"
         )
 
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
             text,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=BACK_KEYBOARD
         )
 
     async def _show_broadcast_info(self, query):
@@ -279,48 +444,45 @@ class AdminHandler:
             "⚠️ **Note:** Use broadcasts responsibly to avoid spam."
         )
 
-        keyboard = [[InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
         await query.edit_message_text(
             text,
             parse_mode='Markdown',
-            reply_markup=reply_markup
+            reply_markup=BACK_KEYBOARD
         )
 
     async def _toggle_bot_status(self, query):
         """Toggle bot enabled/disabled status"""
-        current_status = await self.db.get_bot_status()
+        current_status = await self._get_bot_status()
         new_status = not current_status.get('enabled', True)
 
         success = await self.db.set_bot_status(new_status)
 
         if success:
+            # Reflect the toggle immediately instead of waiting out the TTL
+            self._invalidate_cache("bot_status")
             status_text = "enabled" if new_status else "disabled"
             await query.edit_message_text(
                 f"✅ **Bot {status_text} successfully**\n\n"
                 f"Bot is now {'✅ Enabled' if new_status else '🔴 Disabled'}.\n\n"
                 "Click refresh to update the admin panel.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("🔄 Refresh Panel", callback_data="admin_refresh")
-                ]])
+                reply_markup=REFRESH_PANEL_KEYBOARD
             )
 
-            # Log admin action
-            await self.db.log_admin_action(
-                query.from_user.id,
-                f"Bot {'enabled' if new_status else 'disabled'}",
-                details=f"Bot status changed to {status_text}"
+            # Log in the background - the admin already has their reply
+            self._log_in_background(
+                self.db.log_admin_action(
+                    query.from_user.id,
+                    f"Bot {'enabled' if new_status else 'disabled'}",
+                    details=f"Bot status changed to {status_text}"
+                )
             )
         else:
             await query.edit_message_text(
                 "❌ **Failed to change bot status**\n\n"
                 "Please try again.",
                 parse_mode='Markdown',
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("🔙 Back", callback_data="admin_refresh")
-                ]])
+                reply_markup=BACK_KEYBOARD
             )
 
     # Command handlers
@@ -333,43 +495,40 @@ class AdminHandler:
             return
 
         if not context.args or not context.args[0].isdigit():
-            await update.message.reply_text(
-                "❌ **Invalid usage**\n\n"
-                "**Usage:** `/adduser <user_id>`\n"
-                "**Example:** `/adduser 123456789`"
-            )
+            await update.message.reply_text(ADD_USER_USAGE)
             return
 
         user_id = int(context.args[0])
         username = context.args[1] if len(context.args) > 1 else None
 
-        # Check if user is already authorized
-        if await self.db.is_user_authorized(user_id):
+        # Single upsert instead of check-then-insert; also closes the race
+        # where two admins add the same user concurrently
+        result = await self.db.add_authorized_user_if_absent(user_id, username, admin_id)
+
+        if result == "exists":
             await update.message.reply_text(
                 f"ℹ️ **User already authorized**\n\n"
                 f"User `{user_id}` is already in the authorized list."
             )
             return
 
-        success = await self.db.add_authorized_user(user_id, username, admin_id)
-
-        if success:
+        if result == "added":
             await update.message.reply_text(
                 f"✅ **User added successfully**\n\n"
                 f"User `{user_id}` has been added to the authorized list."
             )
 
-            # Log admin action
-            await self.db.log_admin_action(
-                admin_id,
-                "User added",
-                target_user=user_id,
-                details=f"Added user {user_id} to authorized list"
-            )
-
-            # Log to admin channel
-            await self.bot_logger.log_admin_action(
-                admin_id, f"Added user {user_id} to authorized list"
+            # Log in the background - the admin already has their reply
+            self._log_in_background(
+                self.db.log_admin_action(
+                    admin_id,
+                    "User added",
+                    target_user=user_id,
+                    details=f"Added user {user_id} to authorized list"
+                ),
+                self.bot_logger.log_admin_action(
+                    admin_id, f"Added user {user_id} to authorized list"
+                )
             )
         else:
             await update.message.reply_text(
@@ -386,42 +545,38 @@ class AdminHandler:
             return
 
         if not context.args or not context.args[0].isdigit():
-            await update.message.reply_text(
-                "❌ **Invalid usage**\n\n"
-                "**Usage:** `/removeuser <user_id>`\n"
-                "**Example:** `/removeuser 123456789`"
-            )
+            await update.message.reply_text(REMOVE_USER_USAGE)
             return
 
         user_id = int(context.args[0])
 
-        # Check if user is authorized
-        if not await self.db.is_user_authorized(user_id):
+        # Single delete instead of check-then-delete
+        result = await self.db.remove_authorized_user(user_id)
+
+        if result == "not_found":
             await update.message.reply_text(
                 f"ℹ️ **User not found**\n\n"
                 f"User `{user_id}` is not in the authorized list."
             )
             return
 
-        success = await self.db.remove_authorized_user(user_id)
-
-        if success:
+        if result == "removed":
             await update.message.reply_text(
                 f"✅ **User removed successfully**\n\n"
                 f"User `{user_id}` has been removed from the authorized list."
             )
 
-            # Log admin action
-            await self.db.log_admin_action(
-                admin_id,
-                "User removed",
-                target_user=user_id,
-                details=f"Removed user {user_id} from authorized list"
-            )
-
-            # Log to admin channel
-            await self.bot_logger.log_admin_action(
-                admin_id, f"Removed user {user_id} from authorized list"
+            # Log in the background - the admin already has their reply
+            self._log_in_background(
+                self.db.log_admin_action(
+                    admin_id,
+                    "User removed",
+                    target_user=user_id,
+                    details=f"Removed user {user_id} from authorized list"
+                ),
+                self.bot_logger.log_admin_action(
+                    admin_id, f"Removed user {user_id} from authorized list"
+                )
             )
         else:
             await update.message.reply_text(
@@ -438,27 +593,23 @@ class AdminHandler:
             return
 
         if not context.args or not context.args[0].isdigit():
-            await update.message.reply_text(
-                "❌ **Invalid usage**\n\n"
-                "**Usage:** `/ban <user_id> [reason]`\n"
-                "**Example:** `/ban 123456789 Spam behavior`"
-            )
+            await update.message.reply_text(BAN_USER_USAGE)
             return
 
         user_id = int(context.args[0])
         reason = " ".join(context.args[1:]) if len(context.args) > 1 else "No reason provided"
 
-        # Check if user is already banned
-        if await self.db.is_user_banned(user_id):
+        # Single upsert instead of check-then-insert
+        result = await self.db.ban_user(user_id, reason, admin_id)
+
+        if result == "already_banned":
             await update.message.reply_text(
                 f"ℹ️ **User already banned**\n\n"
                 f"User `{user_id}` is already banned."
             )
             return
 
-        success = await self.db.ban_user(user_id, reason, admin_id)
-
-        if success:
+        if result == "banned":
             await update.message.reply_text(
                 f"✅ **User banned successfully**\n\n"
                 f"**User:** `{user_id}`\n"
@@ -466,17 +617,17 @@ class AdminHandler:
                 f"**Banned by:** Admin `{admin_id}`"
             )
 
-            # Log admin action
-            await self.db.log_admin_action(
-                admin_id,
-                "User banned",
-                target_user=user_id,
-                details=f"Banned user {user_id}: {reason}"
-            )
-
-            # Log to admin channel
-            await self.bot_logger.log_admin_action(
-                admin_id, f"Banned user {user_id}: {reason}"
+            # Log in the background - the admin already has their reply
+            self._log_in_background(
+                self.db.log_admin_action(
+                    admin_id,
+                    "User banned",
+                    target_user=user_id,
+                    details=f"Banned user {user_id}: {reason}"
+                ),
+                self.bot_logger.log_admin_action(
+                    admin_id, f"Banned user {user_id}: {reason}"
+                )
             )
         else:
             await update.message.reply_text(
@@ -493,42 +644,38 @@ class AdminHandler:
             return
 
         if not context.args or not context.args[0].isdigit():
-            await update.message.reply_text(
-                "❌ **Invalid usage**\n\n"
-                "**Usage:** `/unban <user_id>`\n"
-                "**Example:** `/unban 123456789`"
-            )
+            await update.message.reply_text(UNBAN_USER_USAGE)
             return
 
         user_id = int(context.args[0])
 
-        # Check if user is banned
-        if not await self.db.is_user_banned(user_id):
+        # Single delete instead of check-then-delete
+        result = await self.db.unban_user(user_id)
+
+        if result == "not_banned":
             await update.message.reply_text(
                 f"ℹ️ **User not banned**\n\n"
                 f"User `{user_id}` is not currently banned."
             )
             return
 
-        success = await self.db.unban_user(user_id)
-
-        if success:
+        if result == "unbanned":
             await update.message.reply_text(
                 f"✅ **User unbanned successfully**\n\n"
                 f"User `{user_id}` has been unbanned."
             )
 
-            # Log admin action
-            await self.db.log_admin_action(
-                admin_id,
-                "User unbanned",
-                target_user=user_id,
-                details=f"Unbanned user {user_id}"
-            )
-
-            # Log to admin channel
-            await self.bot_logger.log_admin_action(
-                admin_id, f"Unbanned user {user_id}"
+            # Log in the background - the admin already has their reply
+            self._log_in_background(
+                self.db.log_admin_action(
+                    admin_id,
+                    "User unbanned",
+                    target_user=user_id,
+                    details=f"Unbanned user {user_id}"
+                ),
+                self.bot_logger.log_admin_action(
+                    admin_id, f"Unbanned user {user_id}"
+                )
             )
         else:
             await update.message.reply_text(
@@ -545,65 +692,93 @@ class AdminHandler:
             return
 
         if not context.args:
-            await update.message.reply_text(
-                "❌ **No message provided**\n\n"
-                "**Usage:** `/broadcast <message>`\n"
-                "**Example:** `/broadcast 🎉 **Update Alert**\\n\\nNew features available!`\n\n"
-                "**Note:** Use \\\\n for line breaks in the message."
-            )
+            await update.message.reply_text(BROADCAST_USAGE)
             return
 
-        message = " ".join(context.args).replace("\\n", "\n")
+        # Unescape per-arg before joining - avoids a second pass over the
+        # full joined message
+        message = " ".join(arg.replace("\\n", "\n") for arg in context.args)
 
-        # Get all authorized users
-        users = await self.db.get_authorized_users()
+        total_users = await self.db.count_authorized_users()
 
-        if not users:
+        if not total_users:
             await update.message.reply_text("❌ **No users to broadcast to**")
             return
 
         # Send confirmation
         confirm_msg = await update.message.reply_text(
-            f"📢 **Broadcasting to {len(users)} users...**\n\n"
+            f"📢 **Broadcasting to {total_users} users...**\n\n"
             "⏳ *This may take a few moments...*"
         )
 
-        # Broadcast to users
-        success_count = 0
-        fail_count = 0
+        # Build the message text and send kwargs once, not per recipient
+        send_kwargs = {
+            "text": f"📢 **Broadcast Message**\n\n{message}",
+            "parse_mode": 'Markdown'
+        }
 
-        for user in users:
+        async def send_to_user(user) -> bool:
             try:
-                await context.bot.send_message(
-                    chat_id=user['user_id'],
-                    text=f"📢 **Broadcast Message**\n\n{message}",
-                    parse_mode='Markdown'
-                )
-                success_count += 1
+                await context.bot.send_message(chat_id=user['user_id'], **send_kwargs)
+                return True
+            except RetryAfter as e:
+                # Flood control hit - wait it out and retry once
+                await asyncio.sleep(e.retry_after)
+                try:
+                    await context.bot.send_message(chat_id=user['user_id'], **send_kwargs)
+                    return True
+                except Exception as retry_error:
+                    logger.error(f"Failed to send broadcast to {user['user_id']} after retry: {retry_error}")
+                    return False
             except Exception as e:
                 logger.error(f"Failed to send broadcast to {user['user_id']}: {e}")
-                fail_count += 1
+                return False
+
+        # Stream users from the database through a bounded queue so sends
+        # start immediately and memory stays flat regardless of user count.
+        # 25 workers keeps us under Telegram's ~30 msg/s flood limit.
+        success_count = 0
+        fail_count = 0
+        queue = asyncio.Queue(maxsize=50)
+
+        async def broadcast_worker():
+            nonlocal success_count, fail_count
+            while True:
+                user = await queue.get()
+                if user is None:
+                    break
+                if await send_to_user(user):
+                    success_count += 1
+                else:
+                    fail_count += 1
+
+        workers = [asyncio.create_task(broadcast_worker()) for _ in range(25)]
+
+        async for user in self.db.iter_authorized_users(projection=["user_id"]):
+            await queue.put(user)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
 
         # Update confirmation message
         await confirm_msg.edit_text(
             f"📢 **Broadcast Complete**\n\n"
             f"✅ **Delivered:** {success_count} users\n"
             f"❌ **Failed:** {fail_count} users\n"
-            f"📊 **Total:** {len(users)} users\n\n"
+            f"📊 **Total:** {total_users} users\n\n"
             f"**Message:** {message[:100]}{'...' if len(message) > 100 else ''}",
             parse_mode='Markdown'
         )
 
-        # Log admin action
-        await self.db.log_admin_action(
-            admin_id,
-            "Broadcast sent",
-            details=f"Sent to {success_count}/{len(users)} users: {message[:50]}..."
-        )
-
-        # Log to admin channel
-        await self.bot_logger.log_admin_action(
-            admin_id, f"Broadcast sent to {success_count}/{len(users)} users"
+        # Log in the background - one structured row instead of a
+        # free-text admin action, so broadcast history stays queryable
+        self._log_in_background(
+            self.db.log_broadcast(
+                admin_id, success_count, fail_count, total_users, message[:50]
+            ),
+            self.bot_logger.log_admin_action(
+                admin_id, f"Broadcast sent to {success_count}/{total_users} users"
+            )
         )
 
     async def list_users(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -614,40 +789,53 @@ class AdminHandler:
             await update.message.reply_text("❌ **Access Denied** - Admin only command.")
             return
 
-        users = await self.db.get_authorized_users()
-
-        if not users:
+        total_users = await self.db.count_authorized_users()
+        if not total_users:
             await update.message.reply_text("❌ **No authorized users found**")
             return
 
-        # Sort users by total generations
-        users.sort(key=lambda x: x.get('total_generations', 0), reverse=True)
+        # Build message parts with list-append + join (O(N)) instead of
+        # repeated string concatenation, tracking length with a counter
+        header = f"👥 **Authorized Users** ({total_users} total)\n\n"
+        continued_header = "👥 **Authorized Users** (continued)\n\n"
 
         message_parts = []
-        current_message = f"👥 **Authorized Users** ({len(users)} total)\n\n"
-
-        for i, user in enumerate(users, 1):
+        buffer = [header]
+        buffer_len = len(header)
+
+        # Stream the cursor instead of materialising every user document,
+        # still sorted by total generations at the database (indexed)
+        i = 0
+        async for user in self.db.iter_authorized_users(
+            projection=["user_id", "username", "total_generations", "last_active"],
+            order_by='total_generations', desc=True
+        ):
+            i += 1
             username = user.get('username', 'Unknown')
             user_id = user['user_id']
             generations = user.get('total_generations', 0)
             last_active = user.get('last_active', 'Never')
 
             if isinstance(last_active, datetime):
-                last_active = last_active.strftime('%m-%d')
+                last_active = _format_short_date(last_active.date())
 
-            user_line = f"{i}. @{username} (`{user_id}`)\n"
-            user_line += f"   Gen: {generations} | Active: {last_active}\n\n"
+            user_line = (
+                f"{i}. @{username} (`{user_id}`)\n"
+                f"   Gen: {generations} | Active: {last_active}\n\n"
+            )
 
             # Check if adding this user would exceed message length limit
-            if len(current_message + user_line) > 4000:
-                message_parts.append(current_message)
-                current_message = f"👥 **Authorized Users** (continued)\n\n{user_line}"
+            if buffer_len + len(user_line) > 4000:
+                message_parts.append("".join(buffer))
+                buffer = [continued_header, user_line]
+                buffer_len = len(continued_header) + len(user_line)
             else:
-                current_message += user_line
+                buffer.append(user_line)
+                buffer_len += len(user_line)
 
         # Add the last part
-        if current_message.strip():
-            message_parts.append(current_message)
+        if buffer:
+            message_parts.append("".join(buffer))
 
         # Send all message parts
         for part in message_parts:
@@ -661,8 +849,10 @@ class AdminHandler:
             await update.message.reply_text("❌ **Access Denied** - Admin only command.")
             return
 
-        stats = await self.db.get_stats()
-        bot_status = await self.db.get_bot_status()
+        stats = await self._get_stats()
+        bot_status = await self._get_bot_status()
+
+        now_str = datetime.utcnow().isoformat(sep=" ", timespec="seconds")
 
         stats_text = (
             "📊 **MedusaXD Bot Statistics**\n\n"
@@ -686,7 +876,7 @@ class AdminHandler:
             f"• Default Model: {self.config.DEFAULT_MODEL}\n\n"
 
             f"**📅 Report Generated:**\n"
-            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} UTC"
+            f"{now_str} UTC"
         )
 
         await update.message.reply_text(stats_text, parse_mode='Markdown')
@@ -705,23 +895,26 @@ class AdminHandler:
             success = await self.db.set_bot_status(new_status)
 
             if success:
+                self._invalidate_cache("bot_status")
                 status_text = "enabled" if new_status else "disabled"
                 await update.message.reply_text(
                     f"✅ **Bot {status_text} successfully**\n\n"
                     f"Bot is now {'✅ Enabled' if new_status else '🔴 Disabled'}."
                 )
 
-                # Log admin action
-                await self.db.log_admin_action(
-                    admin_id,
-                    f"Bot {status_text}",
-                    details=f"Bot status changed to {status_text}"
+                # Log in the background - the admin already has their reply
+                self._log_in_background(
+                    self.db.log_admin_action(
+                        admin_id,
+                        f"Bot {status_text}",
+                        details=f"Bot status changed to {status_text}"
+                    )
                 )
             else:
                 await update.message.reply_text("❌ **Failed to change bot status**")
         else:
             # Show current status
-            bot_status = await self.db.get_bot_status()
+            bot_status = await self._get_bot_status()
             status_emoji = "✅" if bot_status.get('enabled', True) else "🔴"
             status_text = "Enabled" if bot_status.get('enabled', True) else "Disabled"
 
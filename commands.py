@@ -1,7 +1,8 @@
 """User commands for MedusaXD Bot"""
 
 import asyncio
-import re
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import List
 
@@ -17,6 +18,89 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Permission state changes rarely - cache per-user checks briefly
+PERM_CACHE_TTL = 30
+PERM_CACHE_MAX_SIZE = 4096
+
+# The enable/disable flag changes a few times a day at most
+BOT_STATUS_TTL = 10
+
+# Inline generation option keys, e.g. [model:img4] [aspect:portrait] [count:2]
+OPTION_KEYS = frozenset(("model", "aspect", "count"))
+
+# Static command texts - only the config values vary, so the templates are
+# built once at import and formatted once at handler init. Sent as plain
+# text (no parse_mode) so Telegram does no server-side Markdown parsing.
+HELP_TEMPLATE = (
+    "🎨 MedusaXD Image Generator Bot - Help\n\n"
+
+    "🖼️ Image Generation Commands:\n"
+    "• /generate <prompt> - Generate an image from text\n"
+    "• /models - View available AI models\n\n"
+
+    "📊 User Commands:\n"
+    "• /profile - View your profile and stats\n"
+    "• /help - Show this help message\n\n"
+
+    "🎯 Generation Examples:\n"
+    "• /generate A majestic dragon flying over mountains\n"
+    "• /generate A cyberpunk city at night, neon lights\n"
+    "• /generate Portrait of a wise wizard, fantasy art\n\n"
+
+    "⚙️ Advanced Options:\n"
+    "You can specify model and settings:\n"
+    "• /generate [model:img4] [aspect:portrait] Your prompt here\n\n"
+
+    "Available Models:\n"
+    "• img3 - High-quality general images\n"
+    "• img4 - Enhanced detail and realism\n"
+    "• uncen - Uncensored generation\n\n"
+
+    "Aspect Ratios:\n"
+    "• landscape - 16:9 horizontal\n"
+    "• portrait - 9:16 vertical\n"
+    "• square - 1:1 square\n\n"
+
+    "⏱️ Rate Limits:\n"
+    "• Max {max_requests} requests per {rate_minutes} minutes\n"
+    "• Max {max_images} images per request\n\n"
+
+    "💡 Tips:\n"
+    "• Be descriptive in your prompts\n"
+    "• Specify art style, lighting, mood\n"
+    "• Use quality keywords like 'detailed', 'high resolution'\n\n"
+
+    "✨ Unleash your creativity with MedusaXD!"
+)
+
+MODELS_TEMPLATE = (
+    "🤖 Available AI Models\n\n"
+
+    "🎨 img3 - Standard Quality\n"
+    "• High-quality general image generation\n"
+    "• Fast processing time\n"
+    "• Good for most use cases\n\n"
+
+    "✨ img4 - Enhanced Quality\n"
+    "• Superior detail and realism\n"
+    "• Advanced AI algorithms\n"
+    "• Best for professional results\n\n"
+
+    "🔥 uncen - Uncensored\n"
+    "• No content restrictions\n"
+    "• Creative freedom\n"
+    "• Use responsibly\n\n"
+
+    "Default Model: {default_model}\n\n"
+
+    "How to use:\n"
+    "• Default: /generate Your amazing prompt\n"
+    "• Specify model: /generate [model:img4] Your prompt\n"
+    "• With aspect ratio: /generate [model:img4] [aspect:portrait] Your prompt\n\n"
+
+    "💡 Pro Tip: img4 produces the highest quality but may take slightly longer to generate."
+)
+
 class CommandHandler:
     def __init__(self, db: Database, bot_logger: BotLogger, config: Config):
         self.db = db
@@ -24,10 +108,113 @@ class CommandHandler:
         self.config = config
         self.image_generator = MedusaXDImageGenerator()
 
+        # Render the static command texts once - config doesn't change at runtime
+        self._help_text = HELP_TEMPLATE.format(
+            max_requests=config.MAX_REQUESTS_PER_PERIOD,
+            rate_minutes=config.RATE_LIMIT_MINUTES,
+            max_images=config.MAX_IMAGES_PER_REQUEST
+        )
+        self._models_text = MODELS_TEMPLATE.format(default_model=config.DEFAULT_MODEL)
+
+        # Model/aspect catalogs are static - snapshot them once for O(1) lookups
+        self._valid_models = frozenset(self.image_generator.get_models())
+        self._valid_aspects = frozenset(self.image_generator.get_aspect_ratios())
+
+        # Bounded TTL LRU for permission checks
+        # (user_id -> (monotonic_ts, authorized, banned, ban_info))
+        self._perm_cache = OrderedDict()
+
+        # Short-lived bot enable/disable flag cache
+        self._bot_status = None
+        self._bot_status_exp = 0.0
+
+        # Bound in-flight upstream generations globally and per user so a
+        # burst of requests can't exhaust sockets or memory
+        self._gen_sem = asyncio.Semaphore(config.MAX_CONCURRENT_GENERATIONS)
+        self._per_user_inflight = {}
+
+        # In-process token bucket per user: user_id -> [tokens, last_refill].
+        # Atomic within the event loop, so no read-then-write race, and no
+        # database round-trip on the hot path.
+        self._rate_buckets = {}
+        self._rate_capacity = float(config.MAX_REQUESTS_PER_PERIOD)
+        self._rate_refill = config.MAX_REQUESTS_PER_PERIOD / (config.RATE_LIMIT_MINUTES * 60.0)
+
+    async def _get_bot_status(self) -> dict:
+        """Get the bot enable/disable flag, cached with a short TTL"""
+        now = time.monotonic()
+        if self._bot_status is None or now >= self._bot_status_exp:
+            self._bot_status = await self.db.get_bot_status()
+            self._bot_status_exp = now + BOT_STATUS_TTL
+        return self._bot_status
+
+    def invalidate_bot_status(self):
+        """Force a status refresh after an admin enable/disable"""
+        self._bot_status_exp = 0.0
+
+    async def _get_perm_state(self, user_id: int):
+        """Get (authorized, banned, ban_info) for a user, cached with a short TTL"""
+        now = time.monotonic()
+        entry = self._perm_cache.get(user_id)
+        if entry and now - entry[0] < PERM_CACHE_TTL:
+            self._perm_cache.move_to_end(user_id)
+            return entry[1], entry[2], entry[3]
+
+        # Single round-trip pair for authorization and ban state
+        state = await self.db.bulk_user_state([user_id])
+        authorized, banned = state[user_id]
+        ban_info = await self.db.get_ban_info(user_id) if banned else {}
+
+        self._perm_cache[user_id] = (now, authorized, banned, ban_info)
+        self._perm_cache.move_to_end(user_id)
+        while len(self._perm_cache) > PERM_CACHE_MAX_SIZE:
+            self._perm_cache.popitem(last=False)
+        return authorized, banned, ban_info
+
+    def _refill_bucket(self, user_id: int) -> list:
+        """Refill a user's token bucket based on elapsed time"""
+        now = time.monotonic()
+        bucket = self._rate_buckets.get(user_id)
+        if bucket is None:
+            # Full buckets carry no state worth keeping - prune them before
+            # adding a new user so the dict doesn't grow forever
+            if len(self._rate_buckets) > 10000:
+                self._rate_buckets = {
+                    uid: b for uid, b in self._rate_buckets.items()
+                    if b[0] + (now - b[1]) * self._rate_refill < self._rate_capacity
+                }
+            bucket = [self._rate_capacity, now]
+            self._rate_buckets[user_id] = bucket
+        else:
+            bucket[0] = min(self._rate_capacity, bucket[0] + (now - bucket[1]) * self._rate_refill)
+            bucket[1] = now
+        return bucket
+
+    def _rate_limit_allow(self, user_id: int) -> bool:
+        """Consume one rate-limit token if the user has one available"""
+        bucket = self._refill_bucket(user_id)
+        if bucket[0] >= 1.0:
+            bucket[0] -= 1.0
+            return True
+        return False
+
+    def _rate_limit_peek(self, user_id: int) -> bool:
+        """Check token availability without consuming one"""
+        return self._refill_bucket(user_id)[0] >= 1.0
+
+    def invalidate_permissions(self, user_id: int):
+        """Drop a user's cached permission state after admin mutations"""
+        self._perm_cache.pop(user_id, None)
+
     async def _check_user_permissions(self, update: Update, user_id: int, username: str) -> bool:
         """Check if user has permissions to use the bot"""
+        # Bot status and per-user state are independent lookups
+        bot_status, (authorized, banned, ban_info) = await asyncio.gather(
+            self._get_bot_status(),
+            self._get_perm_state(user_id)
+        )
+
         # Check if bot is enabled
-        bot_status = await self.db.get_bot_status()
         if not bot_status.get('enabled', True):
             await update.message.reply_text(
                 "🚫 **MedusaXD Bot is currently disabled.**\n\n"
@@ -37,7 +224,7 @@ class CommandHandler:
             return False
 
         # Check if user is authorized
-        if not await self.db.is_user_authorized(user_id):
+        if not authorized:
             await update.message.reply_text(
                 "🔒 **Access Denied**\n\n"
                 "You are not authorized to use MedusaXD Image Generator Bot.\n"
@@ -47,8 +234,7 @@ class CommandHandler:
             return False
 
         # Check if user is banned
-        if await self.db.is_user_banned(user_id):
-            ban_info = await self.db.get_ban_info(user_id)
+        if banned:
             await update.message.reply_text(
                 f"🚫 **You are banned from using this bot**\n\n"
                 f"**Reason:** {ban_info.get('reason', 'No reason provided')}\n"
@@ -58,8 +244,8 @@ class CommandHandler:
             )
             return False
 
-        # Update user activity
-        await self.db.update_user_activity(user_id, username)
+        # Update user activity off the command path
+        self.db.queue_user_activity(user_id, username)
         return True
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -72,49 +258,7 @@ class CommandHandler:
         if not await self._check_user_permissions(update, user_id, username):
             return
 
-        help_text = (
-            "🎨 **MedusaXD Image Generator Bot - Help**\n\n"
-
-            "**🖼️ Image Generation Commands:**\n"
-            "• `/generate <prompt>` - Generate an image from text\n"
-            "• `/models` - View available AI models\n\n"
-
-            "**📊 User Commands:**\n"
-            "• `/profile` - View your profile and stats\n"
-            "• `/help` - Show this help message\n\n"
-
-            "**🎯 Generation Examples:**\n"
-            "• `/generate A majestic dragon flying over mountains`\n"
-            "• `/generate A cyberpunk city at night, neon lights`\n"
-            "• `/generate Portrait of a wise wizard, fantasy art`\n\n"
-
-            "**⚙️ Advanced Options:**\n"
-            "You can specify model and settings:\n"
-            "• `/generate [model:img4] [aspect:portrait] Your prompt here`\n\n"
-
-            "**Available Models:**\n"
-            f"• `img3` - High-quality general images\n"
-            f"• `img4` - Enhanced detail and realism\n"
-            f"• `uncen` - Uncensored generation\n\n"
-
-            "**Aspect Ratios:**\n"
-            "• `landscape` - 16:9 horizontal\n"
-            "• `portrait` - 9:16 vertical\n"
-            "• `square` - 1:1 square\n\n"
-
-            f"**⏱️ Rate Limits:**\n"
-            f"• Max {self.config.MAX_REQUESTS_PER_PERIOD} requests per {self.config.RATE_LIMIT_MINUTES} minutes\n"
-            f"• Max {self.config.MAX_IMAGES_PER_REQUEST} images per request\n\n"
-
-            "**💡 Tips:**\n"
-            "• Be descriptive in your prompts\n"
-            "• Specify art style, lighting, mood\n"
-            "• Use quality keywords like 'detailed', 'high resolution'\n\n"
-
-            "✨ *Unleash your creativity with MedusaXD!*"
-        )
-
-        await update.message.reply_text(help_text, parse_mode='Markdown')
+        await update.message.reply_text(self._help_text)
 
     async def models_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /models command"""
@@ -126,35 +270,7 @@ class CommandHandler:
         if not await self._check_user_permissions(update, user_id, username):
             return
 
-        models_text = (
-            "🤖 **Available AI Models**\n\n"
-
-            "**🎨 img3** - *Standard Quality*\n"
-            "• High-quality general image generation\n"
-            "• Fast processing time\n"
-            "• Good for most use cases\n\n"
-
-            "**✨ img4** - *Enhanced Quality*\n"
-            "• Superior detail and realism\n"
-            "• Advanced AI algorithms\n"
-            "• Best for professional results\n\n"
-
-            "**🔥 uncen** - *Uncensored*\n"
-            "• No content restrictions\n"
-            "• Creative freedom\n"
-            "• Use responsibly\n\n"
-
-            f"**Default Model:** `{self.config.DEFAULT_MODEL}`\n\n"
-
-            "**How to use:**\n"
-            "• Default: `/generate Your amazing prompt`\n"
-            "• Specify model: `/generate [model:img4] Your prompt`\n"
-            "• With aspect ratio: `/generate [model:img4] [aspect:portrait] Your prompt`\n\n"
-
-            "**💡 Pro Tip:** img4 produces the highest quality but may take slightly longer to generate."
-        )
-
-        await update.message.reply_text(models_text, parse_mode='Markdown')
+        await update.message.reply_text(self._models_text)
 
     async def profile_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /profile command"""
@@ -166,9 +282,11 @@ class CommandHandler:
         if not await self._check_user_permissions(update, user_id, username):
             return
 
-        # Get user data
-        users = await self.db.get_authorized_users()
-        user_data = next((u for u in users if u['user_id'] == user_id), None)
+        # Get user data with a single indexed lookup
+        user_data = await self.db.get_user(
+            user_id,
+            projection=["total_generations", "authorized_at", "last_active"]
+        )
 
         if not user_data:
             await update.message.reply_text(
@@ -178,11 +296,13 @@ class CommandHandler:
             return
 
         # Check rate limit status
-        can_generate = await self.db.check_rate_limit(
-            user_id, 
-            self.config.RATE_LIMIT_MINUTES, 
-            self.config.MAX_REQUESTS_PER_PERIOD
-        )
+        can_generate = self._rate_limit_peek(user_id)
+
+        # Format the timestamps once instead of inline in the f-string
+        authorized_at = user_data.get('authorized_at')
+        last_active = user_data.get('last_active')
+        member_since = authorized_at.strftime('%Y-%m-%d') if authorized_at else 'Unknown'
+        last_seen = last_active.strftime('%Y-%m-%d %H:%M') if last_active else 'Unknown'
 
         profile_text = (
             f"👤 **Profile: {username}**\n\n"
@@ -190,8 +310,8 @@ class CommandHandler:
             f"**📊 Statistics:**\n"
             f"• User ID: `{user_id}`\n"
             f"• Total Generations: `{user_data.get('total_generations', 0)}`\n"
-            f"• Member Since: `{user_data.get('authorized_at', 'Unknown').strftime('%Y-%m-%d') if user_data.get('authorized_at') else 'Unknown'}`\n"
-            f"• Last Active: `{user_data.get('last_active', 'Unknown').strftime('%Y-%m-%d %H:%M') if user_data.get('last_active') else 'Unknown'}`\n\n"
+            f"• Member Since: `{member_since}`\n"
+            f"• Last Active: `{last_seen}`\n\n"
 
             f"**⚡ Rate Limit Status:**\n"
             f"• Status: {'✅ Available' if can_generate else '⏳ Limited'}\n"
@@ -213,29 +333,44 @@ class CommandHandler:
         aspect_ratio = "landscape"
         num_images = 1
 
-        # Extract model
-        model_match = re.search(r'$$model:(\w+)$$', text, re.IGNORECASE)
-        if model_match:
-            specified_model = model_match.group(1).lower()
-            if specified_model in self.image_generator.get_models():
-                model = specified_model
-            text = re.sub(r'$$model:\w+$$', '', text, flags=re.IGNORECASE)
-
-        # Extract aspect ratio
-        aspect_match = re.search(r'$$aspect:(\w+)$$', text, re.IGNORECASE)
-        if aspect_match:
-            specified_aspect = aspect_match.group(1).lower()
-            if specified_aspect in self.image_generator.get_aspect_ratios():
-                aspect_ratio = specified_aspect
-            text = re.sub(r'$$aspect:\w+$$', '', text, flags=re.IGNORECASE)
-
-        # Extract number of images
-        count_match = re.search(r'$$count:(\d+)$$', text, re.IGNORECASE)
-        if count_match:
-            specified_count = int(count_match.group(1))
-            if 1 <= specified_count <= self.config.MAX_IMAGES_PER_REQUEST:
-                num_images = specified_count
-            text = re.sub(r'$$count:\d+$$', '', text, flags=re.IGNORECASE)
+        # Single linear scan: collect [key:value] options and keep the rest
+        # of the text - no regex engine on the hot path
+        options = {}
+        kept = []
+        i = 0
+        while True:
+            start = text.find('[', i)
+            if start == -1:
+                kept.append(text[i:])
+                break
+            end = text.find(']', start + 1)
+            if end == -1:
+                kept.append(text[i:])
+                break
+            key, sep, value = text[start + 1:end].partition(':')
+            key = key.strip().lower()
+            if sep and key in OPTION_KEYS:
+                options.setdefault(key, value.strip().lower())
+                kept.append(text[i:start])
+            else:
+                # Not an option - keep the bracketed text as part of the prompt
+                kept.append(text[i:end + 1])
+            i = end + 1
+        text = ''.join(kept)
+
+        specified_model = options.get('model')
+        if specified_model and specified_model in self._valid_models:
+            model = specified_model
+
+        specified_aspect = options.get('aspect')
+        if specified_aspect and specified_aspect in self._valid_aspects:
+            aspect_ratio = specified_aspect
+
+        specified_count = options.get('count')
+        if specified_count and specified_count.isdigit():
+            count = int(specified_count)
+            if 1 <= count <= self.config.MAX_IMAGES_PER_REQUEST:
+                num_images = count
 
         # Clean up the prompt
         prompt = text.strip()
@@ -252,16 +387,6 @@ class CommandHandler:
         if not await self._check_user_permissions(update, user_id, username):
             return
 
-        # Check rate limit
-        if not await self.db.check_rate_limit(user_id, self.config.RATE_LIMIT_MINUTES, self.config.MAX_REQUESTS_PER_PERIOD):
-            await update.message.reply_text(
-                f"⏳ **Rate limit exceeded**\n\n"
-                f"You can make {self.config.MAX_REQUESTS_PER_PERIOD} requests every {self.config.RATE_LIMIT_MINUTES} minutes.\n"
-                "Please wait before making another request.",
-                parse_mode='Markdown'
-            )
-            return
-
         # Get prompt from command
         if not context.args:
             await update.message.reply_text(
@@ -281,7 +406,9 @@ class CommandHandler:
         # Parse options
         prompt, model, aspect_ratio, num_images = self._parse_generation_options(prompt_text)
 
-        if len(prompt.strip()) < 3:
+        # Validate before spending a rate-limit token - malformed commands
+        # shouldn't count against the user (prompt is already stripped)
+        if len(prompt) < 3:
             await update.message.reply_text(
                 "❌ **Prompt too short**\n\n"
                 "Please provide a more descriptive prompt (at least 3 characters).",
@@ -289,8 +416,25 @@ class CommandHandler:
             )
             return
 
-        # Record the request for rate limiting
-        await self.db.record_request(user_id)
+        # Check rate limit, consuming a token on success
+        if not self._rate_limit_allow(user_id):
+            await update.message.reply_text(
+                f"⏳ **Rate limit exceeded**\n\n"
+                f"You can make {self.config.MAX_REQUESTS_PER_PERIOD} requests every {self.config.RATE_LIMIT_MINUTES} minutes.\n"
+                "Please wait before making another request.",
+                parse_mode='Markdown'
+            )
+            return
+
+        # Reject before doing any work if the user already has too many
+        # generations in flight
+        if self._per_user_inflight.get(user_id, 0) >= self.config.MAX_CONCURRENT_PER_USER:
+            await update.message.reply_text(
+                "⏳ **Too many generations in progress**\n\n"
+                "Please wait for your current request(s) to finish.",
+                parse_mode='Markdown'
+            )
+            return
 
         # Send processing message
         processing_msg = await update.message.reply_text(
@@ -303,51 +447,66 @@ class CommandHandler:
         )
 
         try:
-            # Generate images
-            response = await self.image_generator.generate_images(
-                prompt=prompt,
-                model=model,
-                num_images=num_images,
-                aspect_ratio=aspect_ratio
+            # Stream images out as they complete, holding the concurrency
+            # slot for the whole stream
+            image_urls = []
+
+            # Only the image number varies between captions - build the
+            # invariant part once
+            caption_base = (
+                f"**Prompt:** {prompt}\n"
+                f"**Model:** `{model}` | **Aspect:** `{aspect_ratio}`\n"
+                f"**Generated by:** @{username} (`{user_id}`)"
             )
 
-            # Delete processing message
+            self._per_user_inflight[user_id] = self._per_user_inflight.get(user_id, 0) + 1
+            try:
+                async with self._gen_sem:
+                    async for img in self.image_generator.stream_images(
+                        prompt=prompt,
+                        model=model,
+                        num_images=num_images,
+                        aspect_ratio=aspect_ratio
+                    ):
+                        image_urls.append(img.url)
+                        caption = (
+                            f"🎨 **MedusaXD Generated Image {len(image_urls)}/{num_images}**\n\n"
+                            f"{caption_base}"
+                        )
+                        try:
+                            await update.message.reply_photo(
+                                photo=img.url,
+                                caption=caption,
+                                parse_mode='Markdown'
+                            )
+                        except Exception as e:
+                            logger.error(f"Failed to send image {len(image_urls)}: {e}")
+                            await update.message.reply_text(
+                                f"❌ **Failed to send image {len(image_urls)}**\n\n"
+                                f"Image URL: {img.url}",
+                                parse_mode='Markdown'
+                            )
+            finally:
+                remaining = self._per_user_inflight.get(user_id, 1) - 1
+                if remaining > 0:
+                    self._per_user_inflight[user_id] = remaining
+                else:
+                    self._per_user_inflight.pop(user_id, None)
+
+            if not image_urls:
+                raise RuntimeError("No images were generated")
+
+            # Delete the processing notice only once the images are delivered,
+            # so the chat never shows an empty gap mid-generation
             try:
                 await processing_msg.delete()
             except:
                 pass
 
-            # Send generated images
-            image_urls = [img.url for img in response.data]
-
-            # Send images
-            for i, image_url in enumerate(image_urls):
-                caption = (
-                    f"🎨 **MedusaXD Generated Image {i+1}/{len(image_urls)}**\n\n"
-                    f"**Prompt:** {prompt}\n"
-                    f"**Model:** `{model}` | **Aspect:** `{aspect_ratio}`\n"
-                    f"**Generated by:** @{username} (`{user_id}`)"
-                )
-
-                try:
-                    await update.message.reply_photo(
-                        photo=image_url,
-                        caption=caption,
-                        parse_mode='Markdown'
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to send image {i+1}: {e}")
-                    await update.message.reply_text(
-                        f"❌ **Failed to send image {i+1}**\n\n"
-                        f"Image URL: {image_url}",
-                        parse_mode='Markdown'
-                    )
-
-            # Update user statistics
-            await self.db.increment_user_generations(user_id)
-
-            # Log the generation
-            await self.db.log_generation(
+            # Update user statistics and log the generation off the hot path;
+            # activity and the generation counter are one fused write
+            self.db.queue_generation_record(user_id, username)
+            self.db.queue_generation_log(
                 user_id=user_id,
                 username=username,
                 prompt=prompt,
@@ -364,22 +523,20 @@ class CommandHandler:
         except Exception as e:
             logger.error(f"Image generation failed for user {user_id}: {e}")
 
-            # Delete processing message
-            try:
-                await processing_msg.delete()
-            except:
-                pass
-
-            # Send error message
-            await update.message.reply_text(
+            # Edit the processing message in place - one API call instead of
+            # a delete plus a fresh send
+            error_text = (
                 f"❌ **Image generation failed**\n\n"
                 f"**Error:** {str(e)}\n\n"
-                "Please try again with a different prompt or contact an administrator if the issue persists.",
-                parse_mode='Markdown'
+                "Please try again with a different prompt or contact an administrator if the issue persists."
             )
+            try:
+                await processing_msg.edit_text(error_text, parse_mode='Markdown')
+            except Exception:
+                await update.message.reply_text(error_text, parse_mode='Markdown')
 
             # Log the failure
-            await self.db.log_generation(
+            self.db.queue_generation_log(
                 user_id=user_id,
                 username=username,
                 prompt=prompt,
@@ -6,6 +6,16 @@ from typing import List
 class Config:
     """Bot configuration from environment variables"""
 
+    # Fixed attribute set - saves a per-instance __dict__ and speeds up the
+    # config lookups on the command hot paths
+    __slots__ = (
+        "BOT_TOKEN", "MONGODB_URL", "LOG_CHANNEL_ID",
+        "API_ID", "API_HASH", "ADMIN_IDS",
+        "MAX_IMAGES_PER_REQUEST", "RATE_LIMIT_MINUTES", "MAX_REQUESTS_PER_PERIOD",
+        "DEFAULT_MODEL", "DEFAULT_STYLE", "DEFAULT_ASPECT_RATIO",
+        "MAX_CONCURRENT_GENERATIONS", "MAX_CONCURRENT_PER_USER",
+    )
+
     def __init__(self):
         # Required environment variables
         self.BOT_TOKEN = os.getenv("BOT_TOKEN")
@@ -18,7 +28,9 @@ class Config:
 
         # Admin user IDs
         admin_ids_str = os.getenv("ADMIN_IDS", "")
-        self.ADMIN_IDS = [int(id.strip()) for id in admin_ids_str.split(",") if id.strip().isdigit()]
+        self.ADMIN_IDS = frozenset(
+            int(id.strip()) for id in admin_ids_str.split(",") if id.strip().isdigit()
+        )
 
         # Updated settings for new API
         self.MAX_IMAGES_PER_REQUEST = int(os.getenv("MAX_IMAGES_PER_REQUEST", "4"))
@@ -28,6 +40,10 @@ class Config:
         self.DEFAULT_STYLE = os.getenv("DEFAULT_STYLE", "realistic")
         self.DEFAULT_ASPECT_RATIO = os.getenv("DEFAULT_ASPECT_RATIO", "landscape")
 
+        # Concurrency limits for image generation
+        self.MAX_CONCURRENT_GENERATIONS = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "10"))
+        self.MAX_CONCURRENT_PER_USER = int(os.getenv("MAX_CONCURRENT_PER_USER", "2"))
+
         self._validate_config()
 
     def _validate_config(self):
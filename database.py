@@ -1,24 +1,70 @@
 """Database operations for MedusaXD Bot using MongoDB"""
 
 import asyncio
-from datetime import datetime, timedelta
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import InsertOne, UpdateOne
 from pymongo.errors import PyMongoError
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _utcnow() -> datetime:
+    """Timezone-aware UTC now (datetime.utcnow is deprecated in 3.12)"""
+    return datetime.now(timezone.utc)
+
 class Database:
+    # Connection pool bounds - keep a core of warm connections and enough
+    # headroom that a burst of concurrent updates doesn't queue on checkout
+    MIN_POOL_SIZE = 10
+    MAX_POOL_SIZE = 100
+
+    # Queued fire-and-forget writes are flushed as one bulk_write per
+    # collection once this many ops or this much time has accumulated.
+    # The queue is a bounded ring: if Mongo is down long enough to back up
+    # 100k ops, the oldest are dropped instead of OOMing the process.
+    WRITE_FLUSH_BATCH = 500
+    WRITE_FLUSH_SECONDS = 0.1
+    WRITE_QUEUE_MAX = 100_000
+
+    # Per-user state (authorized/admin/banned) is read on every update but
+    # mutated rarely; cache it briefly and write through on mutation
+    STATE_CACHE_TTL = 30
+    STATE_CACHE_MAX_SIZE = 10000
+
     def __init__(self, mongodb_url: str):
         self.mongodb_url = mongodb_url
         self.client = None
         self.db = None
+        self._write_queue = None
+        self._write_event = None
+        self._write_task = None
+
+        # Sliding-window request timestamps per user, kept in memory -
+        # rate-limit checks shouldn't cost network round-trips
+        self._rate_windows = defaultdict(deque)
+
+        # TTL caches for the per-update state checks
+        # (user_id -> (value, monotonic_ts))
+        self._auth_cache = {}
+        self._admin_cache = {}
+        self._ban_cache = {}
 
     async def connect(self):
         """Connect to MongoDB"""
         try:
-            self.client = AsyncIOMotorClient(self.mongodb_url)
+            self.client = AsyncIOMotorClient(
+                self.mongodb_url,
+                minPoolSize=self.MIN_POOL_SIZE,
+                maxPoolSize=self.MAX_POOL_SIZE,
+                # Fail fast when the server is unreachable instead of the
+                # 30s default, and compress wire traffic for list queries
+                serverSelectionTimeoutMS=3000,
+                compressors="zlib"
+            )
             self.db = self.client.medusaxd_bot
 
             # Test connection
@@ -28,16 +74,34 @@ class Database:
             # Create indexes
             await self._create_indexes()
 
+            # Start the background batcher for fire-and-forget writes
+            self._write_queue = deque(maxlen=self.WRITE_QUEUE_MAX)
+            self._write_event = asyncio.Event()
+            self._write_task = asyncio.create_task(self._write_worker())
+
         except Exception as e:
             logger.error(f"❌ Failed to connect to MongoDB: {e}")
             raise
 
+    async def close(self):
+        """Flush queued writes and shut down the connection"""
+        if self._write_task is not None:
+            # Let the batcher drain what's queued before stopping it
+            while self._write_queue:
+                await asyncio.sleep(self.WRITE_FLUSH_SECONDS)
+            await asyncio.sleep(self.WRITE_FLUSH_SECONDS)
+            self._write_task.cancel()
+            self._write_task = None
+        if self.client is not None:
+            self.client.close()
+
     async def _create_indexes(self):
         """Create database indexes for better performance"""
         try:
             # Users collection indexes
             await self.db.users.create_index("user_id", unique=True)
             await self.db.users.create_index("username")
+            await self.db.users.create_index([("total_generations", -1)])
 
             # Admins collection indexes
             await self.db.admins.create_index("user_id", unique=True)
@@ -45,30 +109,122 @@ class Database:
             # Bans collection indexes
             await self.db.bans.create_index("user_id", unique=True)
 
-            # Logs collection indexes
-            await self.db.logs.create_index("timestamp")
+            # Logs collection indexes - the compound index matches the shape
+            # of the stats queries (action_type + success + timestamp range),
+            # descending timestamp so recent-first scans walk it forward
+            await self.db.logs.create_index(
+                [("action_type", 1), ("success", 1), ("timestamp", -1)]
+            )
             await self.db.logs.create_index("user_id")
-            await self.db.logs.create_index("action_type")
-
-            # Rate limiting collection indexes
-            await self.db.rate_limits.create_index("user_id")
-            await self.db.rate_limits.create_index("timestamp")
 
             logger.info("✅ Database indexes created successfully")
         except Exception as e:
             logger.error(f"❌ Failed to create indexes: {e}")
 
+    # Write batching
+    async def _write_worker(self):
+        """Drain queued writes, flushing one bulk_write per collection"""
+        while True:
+            await self._write_event.wait()
+            # Brief grace period lets bursty ops coalesce into one flush
+            await asyncio.sleep(self.WRITE_FLUSH_SECONDS)
+            self._write_event.clear()
+
+            batch = {}
+            for _ in range(min(len(self._write_queue), self.WRITE_FLUSH_BATCH)):
+                collection, op = self._write_queue.popleft()
+                batch.setdefault(collection, []).append(op)
+            if self._write_queue:
+                # More than one batch backed up - keep draining
+                self._write_event.set()
+
+            for name, ops in batch.items():
+                try:
+                    await self.db[name].bulk_write(ops, ordered=False)
+                except Exception as e:
+                    logger.error(f"Failed to flush {len(ops)} queued writes to '{name}': {e}")
+
+    def _queue_write(self, collection: str, op):
+        """Hand a write to the background batcher without blocking the caller"""
+        if self._write_queue is None:
+            logger.error(f"Write queued before connect(), dropping op for '{collection}'")
+            return
+        if len(self._write_queue) == self._write_queue.maxlen:
+            logger.warning("Write queue full - dropping the oldest queued write")
+        self._write_queue.append((collection, op))
+        self._write_event.set()
+
+    def queue_user_activity(self, user_id: int, username: str = None):
+        """Queue a last-activity update for the background batcher"""
+        update_data = {"last_active": _utcnow()}
+        if username:
+            update_data["username"] = username
+        self._queue_write("users", UpdateOne({"user_id": user_id}, {"$set": update_data}))
+
+    def queue_generation_record(self, user_id: int, username: str = None):
+        """Queue the per-generation user update as one fused op
+
+        Combines the activity touch and the generation-count increment so the
+        user document is written once per generation, not twice.
+        """
+        update_data = {"last_active": _utcnow()}
+        if username:
+            update_data["username"] = username
+        self._queue_write(
+            "users",
+            UpdateOne(
+                {"user_id": user_id},
+                {"$set": update_data, "$inc": {"total_generations": 1}}
+            )
+        )
+
+    def queue_generation_log(self, user_id: int, username: str, prompt: str, model: str,
+                             images: List[str], success: bool = True, error: str = None):
+        """Queue an image-generation log record for the background batcher"""
+        self._queue_write("logs", InsertOne({
+            "user_id": user_id,
+            "username": username,
+            "action_type": "IMAGE_GENERATION",
+            "prompt": prompt,
+            "model": model,
+            "images": images,
+            "success": success,
+            "error": error,
+            "timestamp": _utcnow()
+        }))
+
+    # State caching
+    def _cache_get(self, cache: Dict, key: int) -> Optional[bool]:
+        """Return a cached state value if it hasn't expired"""
+        entry = cache.get(key)
+        if entry and time.monotonic() - entry[1] < self.STATE_CACHE_TTL:
+            return entry[0]
+        return None
+
+    def _cache_put(self, cache: Dict, key: int, value: bool):
+        """Store a state value, evicting expired entries when over budget"""
+        if len(cache) >= self.STATE_CACHE_MAX_SIZE:
+            cutoff = time.monotonic() - self.STATE_CACHE_TTL
+            for k in [k for k, (_, ts) in cache.items() if ts < cutoff]:
+                del cache[k]
+        cache[key] = (value, time.monotonic())
+
     # User Management
     async def add_authorized_user(self, user_id: int, username: str = None, added_by: int = None) -> bool:
         """Add a user to authorized users"""
+        # Upserting an existing user is a no-op, so a fresh cache hit means
+        # the Mongo call can be skipped entirely (common on duplicate updates)
+        if self._cache_get(self._auth_cache, user_id):
+            return True
         try:
+            now = _utcnow()
             user_data = {
                 "user_id": user_id,
                 "username": username,
-                "authorized_at": datetime.utcnow(),
+                "authorized_at": now,
                 "added_by": added_by,
                 "total_generations": 0,
-                "last_active": datetime.utcnow()
+                "last_active": now
             }
 
             await self.db.users.update_one(
@@ -76,43 +232,148 @@ class Database:
                 {"$setOnInsert": user_data},
                 upsert=True
             )
+            self._cache_put(self._auth_cache, user_id, True)
             return True
         except Exception as e:
             logger.error(f"Failed to add authorized user {user_id}: {e}")
             return False
 
-    async def remove_authorized_user(self, user_id: int) -> bool:
-        """Remove a user from authorized users"""
+    async def add_authorized_user_if_absent(self, user_id: int, username: str = None,
+                                            added_by: int = None) -> str:
+        """Add a user unless already authorized, in a single upsert.
+
+        Returns "added", "exists" or "error".
+        """
+        if self._cache_get(self._auth_cache, user_id):
+            return "exists"
+        try:
+            now = _utcnow()
+            user_data = {
+                "user_id": user_id,
+                "username": username,
+                "authorized_at": now,
+                "added_by": added_by,
+                "total_generations": 0,
+                "last_active": now
+            }
+
+            result = await self.db.users.update_one(
+                {"user_id": user_id},
+                {"$setOnInsert": user_data},
+                upsert=True
+            )
+            self._cache_put(self._auth_cache, user_id, True)
+            return "added" if result.upserted_id is not None else "exists"
+        except Exception as e:
+            logger.error(f"Failed to add authorized user {user_id}: {e}")
+            return "error"
+
+    async def remove_authorized_user(self, user_id: int) -> str:
+        """Remove a user from authorized users.
+
+        Returns "removed", "not_found" or "error".
+        """
         try:
             result = await self.db.users.delete_one({"user_id": user_id})
-            return result.deleted_count > 0
+            self._cache_put(self._auth_cache, user_id, False)
+            return "removed" if result.deleted_count > 0 else "not_found"
         except Exception as e:
             logger.error(f"Failed to remove authorized user {user_id}: {e}")
-            return False
+            return "error"
 
     async def is_user_authorized(self, user_id: int) -> bool:
         """Check if user is authorized"""
+        cached = self._cache_get(self._auth_cache, user_id)
+        if cached is not None:
+            return cached
         try:
-            user = await self.db.users.find_one({"user_id": user_id})
-            return user is not None
+            user = await self.db.users.find_one(
+                {"user_id": user_id}, projection={"_id": 0, "user_id": 1}
+            )
+            authorized = user is not None
+            self._cache_put(self._auth_cache, user_id, authorized)
+            return authorized
         except Exception as e:
             logger.error(f"Failed to check user authorization {user_id}: {e}")
             return False
 
-    async def get_authorized_users(self) -> List[Dict]:
-        """Get all authorized users"""
+    async def bulk_user_state(self, user_ids: List[int]) -> Dict[int, tuple]:
+        """Get {user_id: (authorized, banned)} for many users in one pass
+
+        One $in query per collection instead of two round-trips per user.
+        """
+        try:
+            id_filter = {"user_id": {"$in": user_ids}}
+            projection = {"user_id": 1, "_id": 0}
+            authorized_docs, banned_docs = await asyncio.gather(
+                self.db.users.find(id_filter, projection).to_list(length=None),
+                self.db.bans.find(id_filter, projection).to_list(length=None)
+            )
+            authorized = {doc["user_id"] for doc in authorized_docs}
+            banned = {doc["user_id"] for doc in banned_docs}
+            return {uid: (uid in authorized, uid in banned) for uid in user_ids}
+        except Exception as e:
+            logger.error(f"Failed to bulk-check user state: {e}")
+            return {uid: (False, False) for uid in user_ids}
+
+    @staticmethod
+    def _build_projection(fields: List[str] = None) -> Optional[Dict]:
+        """Build a Mongo projection dict from a list of field names"""
+        if not fields:
+            return None
+        projection = {field: 1 for field in fields}
+        projection["_id"] = 0
+        return projection
+
+    async def get_authorized_users(self, order_by: str = None, desc: bool = False,
+                                   limit: int = None, projection: List[str] = None) -> List[Dict]:
+        """Get authorized users, optionally sorted, limited and projected at the database"""
         try:
-            cursor = self.db.users.find({})
+            cursor = self.db.users.find({}, self._build_projection(projection))
+            if order_by:
+                cursor = cursor.sort(order_by, -1 if desc else 1)
+            if limit:
+                cursor = cursor.limit(limit)
             users = await cursor.to_list(length=None)
             return users
         except Exception as e:
             logger.error(f"Failed to get authorized users: {e}")
             return []
 
+    async def iter_authorized_users(self, batch_size: int = 500, projection: List[str] = None,
+                                    order_by: str = None, desc: bool = False):
+        """Iterate authorized users without loading them all into memory"""
+        try:
+            cursor = self.db.users.find({}, self._build_projection(projection))
+            if order_by:
+                cursor = cursor.sort(order_by, -1 if desc else 1)
+            async for user in cursor.batch_size(batch_size):
+                yield user
+        except Exception as e:
+            logger.error(f"Failed to iterate authorized users: {e}")
+
+    async def get_user(self, user_id: int, projection: List[str] = None) -> Optional[Dict]:
+        """Get a single authorized user's document"""
+        try:
+            return await self.db.users.find_one(
+                {"user_id": user_id}, self._build_projection(projection)
+            )
+        except Exception as e:
+            logger.error(f"Failed to get user {user_id}: {e}")
+            return None
+
+    async def count_authorized_users(self) -> int:
+        """Count authorized users"""
+        try:
+            return await self.db.users.count_documents({})
+        except Exception as e:
+            logger.error(f"Failed to count authorized users: {e}")
+            return 0
+
     async def update_user_activity(self, user_id: int, username: str = None):
         """Update user's last activity"""
         try:
-            update_data = {"last_active": datetime.utcnow()}
+            update_data = {"last_active": _utcnow()}
             if username:
                 update_data["username"] = username
 
@@ -136,10 +397,12 @@ class Database:
     # Admin Management
     async def add_admin(self, user_id: int) -> bool:
         """Add admin user"""
+        if self._cache_get(self._admin_cache, user_id):
+            return True
         try:
             admin_data = {
                 "user_id": user_id,
-                "added_at": datetime.utcnow()
+                "added_at": _utcnow()
             }
 
             await self.db.admins.update_one(
@@ -147,6 +410,7 @@ class Database:
                 {"$setOnInsert": admin_data},
                 upsert=True
             )
+            self._cache_put(self._admin_cache, user_id, True)
             return True
         except Exception as e:
             logger.error(f"Failed to add admin {user_id}: {e}")
@@ -154,48 +418,70 @@ class Database:
 
     async def is_admin(self, user_id: int) -> bool:
         """Check if user is admin"""
+        cached = self._cache_get(self._admin_cache, user_id)
+        if cached is not None:
+            return cached
         try:
-            admin = await self.db.admins.find_one({"user_id": user_id})
-            return admin is not None
+            admin = await self.db.admins.find_one(
+                {"user_id": user_id}, projection={"_id": 0, "user_id": 1}
+            )
+            is_admin = admin is not None
+            self._cache_put(self._admin_cache, user_id, is_admin)
+            return is_admin
         except Exception as e:
             logger.error(f"Failed to check admin status {user_id}: {e}")
             return False
 
     # Ban System
-    async def ban_user(self, user_id: int, reason: str = "No reason provided", banned_by: int = None) -> bool:
-        """Ban a user"""
+    async def ban_user(self, user_id: int, reason: str = "No reason provided", banned_by: int = None) -> str:
+        """Ban a user unless already banned, in a single upsert.
+
+        Returns "banned", "already_banned" or "error".
+        """
         try:
             ban_data = {
                 "user_id": user_id,
                 "reason": reason,
-                "banned_at": datetime.utcnow(),
+                "banned_at": _utcnow(),
                 "banned_by": banned_by
             }
 
-            await self.db.bans.update_one(
+            result = await self.db.bans.update_one(
                 {"user_id": user_id},
-                {"$set": ban_data},
+                {"$setOnInsert": ban_data},
                 upsert=True
             )
-            return True
+            self._cache_put(self._ban_cache, user_id, True)
+            return "banned" if result.upserted_id is not None else "already_banned"
         except Exception as e:
             logger.error(f"Failed to ban user {user_id}: {e}")
-            return False
+            return "error"
+
+    async def unban_user(self, user_id: int) -> str:
+        """Unban a user.
 
-    async def unban_user(self, user_id: int) -> bool:
-        """Unban a user"""
+        Returns "unbanned", "not_banned" or "error".
+        """
         try:
             result = await self.db.bans.delete_one({"user_id": user_id})
-            return result.deleted_count > 0
+            self._cache_put(self._ban_cache, user_id, False)
+            return "unbanned" if result.deleted_count > 0 else "not_banned"
         except Exception as e:
             logger.error(f"Failed to unban user {user_id}: {e}")
-            return False
+            return "error"
 
     async def is_user_banned(self, user_id: int) -> bool:
         """Check if user is banned"""
+        cached = self._cache_get(self._ban_cache, user_id)
+        if cached is not None:
+            return cached
         try:
-            ban = await self.db.bans.find_one({"user_id": user_id})
-            return ban is not None
+            ban = await self.db.bans.find_one(
+                {"user_id": user_id}, projection={"_id": 0, "user_id": 1}
+            )
+            banned = ban is not None
+            self._cache_put(self._ban_cache, user_id, banned)
+            return banned
         except Exception as e:
             logger.error(f"Failed to check ban status {user_id}: {e}")
             return False
@@ -209,23 +495,36 @@ class Database:
             logger.error(f"Failed to get ban info {user_id}: {e}")
             return {}
 
-    async def get_banned_users(self) -> List[Dict]:
-        """Get all banned users"""
+    async def get_banned_users(self, limit: int = None) -> List[Dict]:
+        """Get banned users, optionally limited at the database"""
         try:
-            cursor = self.db.bans.find({})
-            bans = await cursor.to_list(length=None)
+            # Only the fields the ban list actually renders
+            cursor = self.db.bans.find(
+                {}, self._build_projection(["user_id", "reason", "banned_at"])
+            )
+            if limit:
+                cursor = cursor.limit(limit)
+            bans = await cursor.to_list(length=limit)
             return bans
         except Exception as e:
             logger.error(f"Failed to get banned users: {e}")
             return []
 
+    async def count_banned_users(self) -> int:
+        """Count banned users"""
+        try:
+            return await self.db.bans.count_documents({})
+        except Exception as e:
+            logger.error(f"Failed to count banned users: {e}")
+            return 0
+
     # Bot Status
     async def set_bot_status(self, enabled: bool) -> bool:
         """Set bot enabled/disabled status"""
         try:
             await self.db.bot_settings.update_one(
                 {"setting": "bot_status"},
-                {"$set": {"enabled": enabled, "updated_at": datetime.utcnow()}},
+                {"$set": {"enabled": enabled, "updated_at": _utcnow()}},
                 upsert=True
             )
             return True
@@ -244,95 +543,92 @@ class Database:
 
     # Rate Limiting
     async def check_rate_limit(self, user_id: int, limit_minutes: int = 5, max_requests: int = 10) -> bool:
-        """Check if user has exceeded rate limit"""
-        try:
-            cutoff_time = datetime.utcnow() - timedelta(minutes=limit_minutes)
+        """Check if user has exceeded rate limit (in-memory sliding window)"""
+        window = self._rate_windows.get(user_id)
+        if not window:
+            return True
 
-            # Count recent requests
-            count = await self.db.rate_limits.count_documents({
-                "user_id": user_id,
-                "timestamp": {"$gte": cutoff_time}
-            })
+        # Evict timestamps that fell out of the window
+        cutoff = time.monotonic() - limit_minutes * 60
+        while window and window[0] < cutoff:
+            window.popleft()
+        if not window:
+            del self._rate_windows[user_id]
+            return True
 
-            return count < max_requests
-        except Exception as e:
-            logger.error(f"Failed to check rate limit for user {user_id}: {e}")
-            return True  # Allow on error
+        return len(window) < max_requests
 
-    async def record_request(self, user_id: int):
-        """Record a user request for rate limiting"""
-        try:
-            await self.db.rate_limits.insert_one({
-                "user_id": user_id,
-                "timestamp": datetime.utcnow()
-            })
-
-            # Clean old records (older than 1 hour)
-            cutoff_time = datetime.utcnow() - timedelta(hours=1)
-            await self.db.rate_limits.delete_many({
-                "timestamp": {"$lt": cutoff_time}
-            })
-        except Exception as e:
-            logger.error(f"Failed to record request for user {user_id}: {e}")
+    def record_request(self, user_id: int):
+        """Record a user request for rate limiting
+
+        Pure in-memory append - no coroutine, nothing to await, so callers
+        pay nothing on the hot path.
+        """
+        self._rate_windows[user_id].append(time.monotonic())
 
     # Logging
-    async def log_generation(self, user_id: int, username: str, prompt: str, model: str, 
+    # Log records are not awaited to disk individually - every log method
+    # hands its document to the background batcher, which flushes the logs
+    # collection with one unordered bulk insert per interval.
+    async def log_generation(self, user_id: int, username: str, prompt: str, model: str,
                            images: List[str], success: bool = True, error: str = None):
         """Log image generation"""
-        try:
-            log_data = {
-                "user_id": user_id,
-                "username": username,
-                "action_type": "IMAGE_GENERATION",
-                "prompt": prompt,
-                "model": model,
-                "images": images,
-                "success": success,
-                "error": error,
-                "timestamp": datetime.utcnow()
-            }
-
-            await self.db.logs.insert_one(log_data)
-        except Exception as e:
-            logger.error(f"Failed to log generation: {e}")
+        self.queue_generation_log(user_id, username, prompt, model, images, success, error)
+
+    async def log_broadcast(self, admin_id: int, success: int, fail: int,
+                            total: int, preview: str):
+        """Log a broadcast outcome as a single structured record"""
+        self._queue_write("logs", InsertOne({
+            "admin_id": admin_id,
+            "action_type": "BROADCAST",
+            "success_count": success,
+            "fail_count": fail,
+            "total_users": total,
+            "preview": preview,
+            "timestamp": _utcnow()
+        }))
 
     async def log_admin_action(self, admin_id: int, action: str, target_user: int = None, details: str = None):
         """Log admin actions"""
-        try:
-            log_data = {
-                "admin_id": admin_id,
-                "action_type": "ADMIN_ACTION",
-                "action": action,
-                "target_user": target_user,
-                "details": details,
-                "timestamp": datetime.utcnow()
-            }
-
-            await self.db.logs.insert_one(log_data)
-        except Exception as e:
-            logger.error(f"Failed to log admin action: {e}")
+        self._queue_write("logs", InsertOne({
+            "admin_id": admin_id,
+            "action_type": "ADMIN_ACTION",
+            "action": action,
+            "target_user": target_user,
+            "details": details,
+            "timestamp": _utcnow()
+        }))
 
     # Statistics
     async def get_stats(self) -> Dict:
         """Get bot statistics"""
         try:
-            total_users = await self.db.users.count_documents({})
-            total_banned = await self.db.bans.count_documents({})
-            total_generations = await self.db.logs.count_documents({"action_type": "IMAGE_GENERATION", "success": True})
-
-            # Recent activity (last 24 hours)
-            recent_cutoff = datetime.utcnow() - timedelta(days=1)
-            recent_generations = await self.db.logs.count_documents({
-                "action_type": "IMAGE_GENERATION",
-                "success": True,
-                "timestamp": {"$gte": recent_cutoff}
-            })
-
-            # Active users (last 7 days)
-            active_cutoff = datetime.utcnow() - timedelta(days=7)
-            active_users = await self.db.users.count_documents({
-                "last_active": {"$gte": active_cutoff}
-            })
+            now = _utcnow()
+            recent_cutoff = now - timedelta(days=1)
+            active_cutoff = now - timedelta(days=7)
+            gen_filter = {"action_type": "IMAGE_GENERATION", "success": True}
+
+            # The four queries are independent - issue them concurrently.
+            # Totals come from collection metadata instead of a scan, and
+            # both generation counts share one $facet pass over logs.
+            total_users, total_banned, facets, active_users = await asyncio.gather(
+                self.db.users.estimated_document_count(),
+                self.db.bans.estimated_document_count(),
+                self.db.logs.aggregate([{
+                    "$facet": {
+                        "total": [{"$match": gen_filter}, {"$count": "n"}],
+                        "recent": [
+                            {"$match": {**gen_filter, "timestamp": {"$gte": recent_cutoff}}},
+                            {"$count": "n"}
+                        ]
+                    }
+                }]).to_list(length=1),
+                self.db.users.count_documents({"last_active": {"$gte": active_cutoff}})
+            )
+
+            facet = facets[0] if facets else {}
+            total_generations = facet["total"][0]["n"] if facet.get("total") else 0
+            recent_generations = facet["recent"][0]["n"] if facet.get("recent") else 0
 
             return {
                 "total_users": total_users,
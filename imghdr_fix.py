@@ -4,28 +4,67 @@ The imghdr module was removed in Python 3.13 but telegram library still needs it
 """
 
 import sys
-from PIL import Image
 import io
 
+# Magic-number prefixes cover virtually every image Telegram hands us -
+# checking them is a few byte comparisons vs a full Pillow open
+_MAGIC = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+)
+
+
+def _sniff(header: bytes):
+    """Detect format from the leading bytes, or None if unrecognised"""
+    for magic, fmt in _MAGIC:
+        if header.startswith(magic):
+            return fmt
+    # WebP is RIFF....WEBP
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
 class ImgHdr:
-    """Minimal imghdr replacement using Pillow"""
+    """Minimal imghdr replacement using magic numbers with a Pillow fallback"""
 
     @staticmethod
     def what(file_path_or_bytes, h=None):
         """Detect image format"""
         try:
-            if isinstance(file_path_or_bytes, (str, bytes)):
-                if isinstance(file_path_or_bytes, str):
-                    # File path
-                    with open(file_path_or_bytes, 'rb') as f:
-                        image = Image.open(f)
-                        return image.format.lower() if image.format else None
-                else:
-                    # Bytes
-                    image = Image.open(io.BytesIO(file_path_or_bytes))
+            # Grab the first 12 bytes without consuming the input
+            if h is not None:
+                header = bytes(h[:12])
+            elif isinstance(file_path_or_bytes, bytes):
+                header = file_path_or_bytes[:12]
+            elif isinstance(file_path_or_bytes, str):
+                with open(file_path_or_bytes, 'rb') as f:
+                    header = f.read(12)
+            else:
+                # File-like object - rewind after peeking
+                pos = file_path_or_bytes.tell()
+                header = file_path_or_bytes.read(12)
+                file_path_or_bytes.seek(pos)
+
+            fmt = _sniff(header)
+            if fmt:
+                return fmt
+
+            # Unrecognised prefix - only now pay for Pillow, imported lazily
+            # so module load doesn't drag in the C-extension graph
+            from PIL import Image
+
+            if isinstance(file_path_or_bytes, str):
+                with open(file_path_or_bytes, 'rb') as f:
+                    image = Image.open(f)
                     return image.format.lower() if image.format else None
+            elif isinstance(file_path_or_bytes, bytes):
+                image = Image.open(io.BytesIO(file_path_or_bytes))
+                return image.format.lower() if image.format else None
             else:
-                # File-like object
                 image = Image.open(file_path_or_bytes)
                 return image.format.lower() if image.format else None
         except Exception:
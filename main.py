@@ -289,7 +289,7 @@ class MedusaXDBot:
             )
             return
 
-        await self.db.record_request(user_id)
+        self.db.record_request(user_id)
 
         # Get model info
         model_info = self.image_generator.get_model_info()
@@ -350,8 +350,9 @@ class MedusaXDBot:
                 if i < len(response.data):  # Small delay between multiple images
                     await asyncio.sleep(0.5)
 
-            # Update statistics and log
-            await self.db.increment_user_generations(user_id)
+            # Update statistics and log - activity and the generation counter
+            # are one fused write
+            self.db.queue_generation_record(user_id, username)
             await self.db.log_generation(user_id, username, parsed["prompt"], parsed["model"], [img.url for img in response.data], True)
 
             # Enhanced logging with flags